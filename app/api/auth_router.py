@@ -1,50 +1,74 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import or_
 from sqlalchemy.future import select
 from app.schemas.auth import signupRequest, signupResponse, TokenResponse, LoginRequest
-from app.models.user import User
+from app.models.user import User, user_by_username
 from app.db.session import get_db
-from app.core.security import JWTHandler
+from app.core.security import create_access_token, get_password_hash, needs_rehash, verify_password
 from app.core.logging import logger
-from app.core.rate_limiting import limiter
+from app.core.rate_limiting import limiter, clear_login_username_limit, hit_login_username_limit, login_username_limit, rate_limit_response
 
 router = APIRouter()
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("5/minute")
 async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
-    logger.info(f"Login attempt for user: {form_data.username}")
-    result = await db.execute(select(User).where(User.username == form_data.username))
-    user = result.scalar_one_or_none()
-    if not user or not JWTHandler.verify_password(form_data.password, user.hashed_password):
-        logger.warning(f"Failed login attempt for user: {form_data.username}")
+    logger.info("Login attempt for user: %s", form_data.username)
+    if not hit_login_username_limit(form_data.username):
+        logger.warning("Login rate limit exceeded for user: %s", form_data.username)
+        return rate_limit_response(f"{login_username_limit} login attempts for this user")
+    user = await db.scalar(user_by_username, {"username": form_data.username})
+    loop = asyncio.get_running_loop()
+    hash_pool = request.app.state.hash_pool
+    if not user or not await loop.run_in_executor(hash_pool, verify_password, form_data.password, user.hashed_password):
+        logger.warning("Failed login attempt for user: %s", form_data.username)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    logger.info(f"User {form_data.username} logged in successfully")
-    access_token = JWTHandler.create_access_token({"sub": user.username})
+    if needs_rehash(user.hashed_password):
+        # Transparently upgrade legacy bcrypt hashes (or outdated Argon2 params) on successful login
+        user.hashed_password = await loop.run_in_executor(hash_pool, get_password_hash, form_data.password)
+        await db.commit()
+    clear_login_username_limit(form_data.username)
+    logger.info("User %s logged in successfully", form_data.username)
+    access_token = create_access_token({"sub": user.username})
     return TokenResponse(access_token=access_token, expires_in=3600, token_type="bearer")
 
+async def _reject_duplicate_signup(db: AsyncSession, request: signupRequest):
+    result = await db.execute(
+        select(User.username, User.email).where(or_(User.username == request.username, User.email == request.email))
+    )
+    rows = result.all()
+    if any(row.username == request.username for row in rows):
+        logger.warning("Signup failed: username %s already exists", request.username)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
+    if rows:
+        logger.warning("Signup failed: email %s already exists", request.email)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
+
 @router.post("/sign_up", response_model=signupResponse)
 @limiter.limit("3/minute")
 async def sign_up(http_request: Request, request: signupRequest, db: AsyncSession = Depends(get_db)):
-    logger.info(f"Signup attempt for username: {request.username}")
-    # Check username
-    result = await db.execute(select(User).where(User.username == request.username))
-    user = result.scalar_one_or_none()
-    if user:
-        logger.warning(f"Signup failed: username {request.username} already exists")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
-    # Check email
-    result = await db.execute(select(User).where(User.email == request.email))
-    user = result.scalar_one_or_none()
-    if user:
-        logger.warning(f"Signup failed: email {request.email} already exists")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-    new_user = User(username=request.username, email=request.email, hashed_password=JWTHandler.get_password_hash(request.password))
-    db.add(new_user)
+    logger.info("Signup attempt for username: %s", request.username)
+    # Cheap probe first so duplicate signups are rejected without paying for an Argon2 hash
+    await _reject_duplicate_signup(db, request)
+    hashed_password = await asyncio.get_running_loop().run_in_executor(http_request.app.state.hash_pool, get_password_hash, request.password)
+    # ON CONFLICT stays as the race-safe backstop for concurrent signups that both passed the probe
+    stmt = (
+        insert(User)
+        .values(username=request.username, email=request.email, hashed_password=hashed_password)
+        .on_conflict_do_nothing()
+        .returning(User.id)
+    )
+    user_id = await db.scalar(stmt)
+    if user_id is None:
+        await _reject_duplicate_signup(db, request)
+        # The conflicting row vanished between the insert and the lookup
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username or email already exists")
     await db.commit()
-    await db.refresh(new_user)
-    logger.info(f"User {new_user.username} created successfully with id {new_user.id}")
+    logger.info("User %s created successfully with id %s", request.username, user_id)
     return signupResponse(message="User created successfully")
     
     
\ No newline at end of file
@@ -1,26 +1,33 @@
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
-from app.core.security import JWTHandler
-from app.models.user import User
+from cachetools import TTLCache
+from app.core.security import decode_access_token
+from app.models.user import User, user_by_username
 from app.db.session import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Resolved users keyed by token subject, detached from any session so they can be shared across requests
+_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = JWTHandler.decode_access_token(token)
+    payload = decode_access_token(token)
     if payload is None or "sub" not in payload:
         raise credentials_exception
     username: str = payload["sub"]
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalar_one_or_none()
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+    user = await db.scalar(user_by_username, {"username": username})
     if user is None:
         raise credentials_exception
+    make_transient(user)
+    _user_cache[username] = user
     return user
@@ -1,5 +1,9 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import ORJSONResponse
 from datetime import datetime,timezone
+from pydantic import TypeAdapter
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, TaskFilters, DeleteResponse
@@ -7,27 +11,59 @@ from app.models.task import Task
 from app.models.user import User
 from app.db.session import get_db
 from app.api.dependencies import get_current_user
+from sqlalchemy import bindparam, delete, func, lambda_stmt, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from app.core.logging import logger
 from app.core.rate_limiting import limiter
 
 router = APIRouter()
 
+_task_list_adapter = TypeAdapter(list[TaskResponse])
+# Built once so each call only binds parameters; lambda_stmt caches the compiled SQL
+_task_by_id = lambda_stmt(lambda: select(Task).where(Task.id == bindparam("task_id"), Task.id_usuario == bindparam("user_id")))
+_task_columns = (Task.id, Task.titulo, Task.descripcion, Task.estado, Task.fecha_creacion, Task.fecha_actualizacion, Task.id_usuario)
+
+def _encode_cursor(task: TaskResponse) -> str:
+    raw = f"{task.fecha_creacion.isoformat()}|{task.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        ts, task_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        cursor_ts, cursor_id = datetime.fromisoformat(ts), UUID(task_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # fecha_creacion is a naive column; an aware timestamp can only come from a tampered cursor
+    if cursor_ts.tzinfo is not None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return cursor_ts, cursor_id
+
+def _is_duplicate_title(exc: IntegrityError) -> bool:
+    # Only a unique violation (SQLSTATE 23505) on uq_tasks_user_titulo means the user already has that title
+    return (
+        getattr(exc.orig, "sqlstate", None) == "23505"
+        and getattr(exc.orig.__cause__, "constraint_name", None) == "uq_tasks_user_titulo"
+    )
+
 @router.post("/", response_model=TaskResponse)
 @limiter.limit("2/minute")
 async def create_task(request: Request, task: TaskCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    logger.info(f"User {current_user.username} creating a new task with title: {task.titulo}")
-    result = await db.execute(select(Task).where(Task.titulo == task.titulo, Task.id_usuario == current_user.id))
-    db_task = result.scalar_one_or_none()
-    if db_task:
-        logger.warning(f"User {current_user.username} failed to create task with title: {task.titulo}. Task already exists.")
+    logger.info("User %s creating a new task with title: %s", current_user.username, task.titulo)
+    # The (id_usuario, titulo) unique constraint replaces the separate existence check
+    new_task = await db.scalar(
+        insert(Task)
+        .values(**task.model_dump(), id_usuario=current_user.id)
+        .on_conflict_do_nothing(index_elements=["id_usuario", "titulo"])
+        .returning(Task)
+    )
+    if new_task is None:
+        logger.warning("User %s failed to create task with title: %s. Task already exists.", current_user.username, task.titulo)
         raise HTTPException(status_code=400, detail="Task already exists")
-    new_task = Task(**task.model_dump(), id_usuario=current_user.id)
-    db.add(new_task)
     await db.commit()
-    await db.refresh(new_task)
 
-    logger.info(f"Task '{new_task.titulo}' created successfully for user {current_user.username} with id {new_task.id}")
+    logger.info("Task '%s' created successfully for user %s with id %s", new_task.titulo, current_user.username, new_task.id)
     return TaskResponse.model_validate(new_task)
 
 @router.get("/", response_model=TaskListResponse)
@@ -37,50 +73,81 @@ async def list_tasks(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page")
 ):
-    result = await db.execute(select(Task).where(Task.id_usuario == current_user.id).offset(offset).limit(limit))
-    tasks = result.scalars().all()
-    total = len(tasks)
-    return TaskListResponse(tasks=[TaskResponse.model_validate(t) for t in tasks], total=total, limit=limit, offset=offset)
+    # AsyncSession cannot run statements concurrently, so the count and the page are awaited in turn
+    total = await db.scalar(select(func.count()).select_from(Task).where(Task.id_usuario == current_user.id))
+    stmt = select(*_task_columns).where(Task.id_usuario == current_user.id)
+    if after is not None:
+        # Keyset pagination: seek past the cursor instead of scanning and discarding OFFSET rows
+        cursor_ts, cursor_id = _decode_cursor(after)
+        stmt = stmt.where(tuple_(Task.fecha_creacion, Task.id) < tuple_(cursor_ts, cursor_id))
+        offset = 0  # ignored when seeking by cursor, so echo 0 back
+    elif offset:
+        stmt = stmt.offset(offset)
+    result = await db.execute(stmt.order_by(Task.fecha_creacion.desc(), Task.id.desc()).limit(limit))
+    # Rows come from typed columns, so skip ORM hydration and Pydantic validation
+    tasks = [TaskResponse.model_construct(**row._mapping) for row in result]
+    next_cursor = _encode_cursor(tasks[-1]) if len(tasks) == limit else None
+    # Returning the response directly skips FastAPI re-validating the page against response_model.
+    # json mode is required: asyncpg returns its own UUID subclass, which orjson refuses to serialize
+    return ORJSONResponse(content={
+        "tasks": _task_list_adapter.dump_python(tasks, mode="json"),
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+    })
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: UUID, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    logger.info(f"User {current_user.username} fetching task with id: {task_id}")
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.id_usuario == current_user.id))
-    task = result.scalar_one_or_none()
+    logger.info("User %s fetching task with id: %s", current_user.username, task_id)
+    task = await db.scalar(_task_by_id, {"task_id": task_id, "user_id": current_user.id})
     if not task:
-        logger.warning(f"User {current_user.username} failed to fetch task with id: {task_id}. Task not found.")
+        logger.warning("User %s failed to fetch task with id: %s. Task not found.", current_user.username, task_id)
         raise HTTPException(status_code=404, detail="Task not found")
-    logger.info(f"User {current_user.username} fetched task with id: {task_id} successfully.")
+    logger.info("User %s fetched task with id: %s successfully.", current_user.username, task_id)
     return TaskResponse.model_validate(task)
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(task_id: UUID, updates: TaskUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    logger.info(f"User {current_user.username} updating task with id: {task_id}")
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.id_usuario == current_user.id))
-    task = result.scalar_one_or_none()
+    logger.info("User %s updating task with id: %s", current_user.username, task_id)
+    update_data = updates.model_dump(exclude_unset=True)
+    if "titulo" in update_data and update_data["titulo"] is None:
+        raise HTTPException(status_code=400, detail="Task title cannot be null")
+    if update_data:
+        # UPDATE ... RETURNING applies the change and reads the row back in one roundtrip
+        try:
+            task = await db.scalar(
+                update(Task)
+                .where(Task.id == task_id, Task.id_usuario == current_user.id)
+                .values(**update_data)
+                .returning(Task)
+            )
+        except IntegrityError as exc:
+            await db.rollback()
+            if not _is_duplicate_title(exc):
+                raise
+            logger.warning("User %s failed to update task with id: %s. Task already exists.", current_user.username, task_id)
+            raise HTTPException(status_code=400, detail="Task already exists")
+    else:
+        task = await db.scalar(_task_by_id, {"task_id": task_id, "user_id": current_user.id})
     if not task:
-        logger.warning(f"User {current_user.username} failed to update task with id: {task_id}. Task not found.")
+        logger.warning("User %s failed to update task with id: %s. Task not found.", current_user.username, task_id)
         raise HTTPException(status_code=404, detail="Task not found")
-    update_data = updates.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
     await db.commit()
-    await db.refresh(task)
-    logger.info(f"User {current_user.username} updated task with id: {task_id} successfully.")
+    logger.info("User %s updated task with id: %s successfully.", current_user.username, task_id)
     return TaskResponse.model_validate(task)
 
 @router.delete("/{task_id}", response_model=DeleteResponse)
 async def delete_task(task_id: UUID, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    logger.info(f"User {current_user.username} deleting task with id: {task_id}")
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.id_usuario == current_user.id))
-    task = result.scalar_one_or_none()
-    if not task:
-        logger.warning(f"User {current_user.username} failed to delete task with id: {task_id}. Task not found.")
+    logger.info("User %s deleting task with id: %s", current_user.username, task_id)
+    deleted_id = await db.scalar(delete(Task).where(Task.id == task_id, Task.id_usuario == current_user.id).returning(Task.id))
+    if deleted_id is None:
+        logger.warning("User %s failed to delete task with id: %s. Task not found.", current_user.username, task_id)
         raise HTTPException(status_code=404, detail="Task not found")
-    await db.delete(task)
     await db.commit()
 
-    logger.info(f"User {current_user.username} deleted task with id: {task_id} successfully.")
+    logger.info("User %s deleted task with id: %s successfully.", current_user.username, task_id)
     return DeleteResponse(message="Task deleted", deleted_at=datetime.now(timezone.utc))
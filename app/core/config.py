@@ -6,6 +6,12 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "supersecretkey"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_SECONDS: int = 3600
+    REDIS_URL: str = "redis://localhost:6379/0"
+    LOG_LEVEL: str = "INFO"
+    # uvicorn also reads WEB_CONCURRENCY as its worker count, so setting it keeps both in sync
+    WEB_CONCURRENCY: int = 1
+    # Password hashing processes per worker; 0 splits the CPUs evenly across WEB_CONCURRENCY workers
+    HASH_POOL_WORKERS: int = 0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,13 +1,16 @@
 import logging
+import queue
 import sys
 from logging import Formatter, StreamHandler
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from app.core.config import settings
 
 
 def setup_logging():
     # Create a logger
     logger = logging.getLogger("app")
-    logger.setLevel(logging.INFO)
+    # Set LOG_LEVEL=WARNING in production to skip per-request info records
+    logger.setLevel(settings.LOG_LEVEL.upper())
 
     # Create a formatter
     formatter = Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -15,14 +18,18 @@ def setup_logging():
     # Create a stream handler for console output
     stream_handler = StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
 
     # Create a file handler for rotating log files
     file_handler = TimedRotatingFileHandler("app.log", when="midnight", interval=1, backupCount=7)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
-    return logger
+    # Request handlers only enqueue records; a background thread does the console/file writes
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, stream_handler, file_handler)
+    listener.start()
 
+    return logger, listener
 
-logger = setup_logging()
+
+logger, log_listener = setup_logging()
@@ -1,27 +1,61 @@
+from limits import parse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from app.core.config import settings
+from app.core.logging import logger
 
-# Create limiter instance with in-memory storage
+# Create limiter instance backed by Redis so limits are shared by every worker;
+# if Redis goes down slowapi switches to per-process in-memory counters instead of failing requests
 limiter = Limiter(
-    key_func=get_remote_address
+    key_func=get_remote_address,
+    storage_uri=settings.REDIS_URL,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True
 )
 
-# Custom rate limit exceeded handler
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    response = JSONResponse(
+# Per-username login limit, applied on top of the per-IP one so rotating IPs doesn't bypass it.
+# The slot is reserved before the password is verified so concurrent attempts can't all slip through;
+# a successful login clears the window again
+login_username_limit = parse("5/minute")
+
+# These go through limiter.limiter (sync) rather than a limits.aio storage so they share slowapi's
+# in-memory fallback; the route's own slowapi check already makes the same sync Redis call per request
+def hit_login_username_limit(username: str) -> bool:
+    """Reserve a login attempt for username; returns False once the limit is used up"""
+    try:
+        return limiter.limiter.hit(login_username_limit, "login", username)
+    except Exception as exc:
+        # Redis failed after the route's check already passed; the per-IP limit still applies, so don't 500
+        logger.warning("Login username limit unavailable: %s", exc)
+        return True
+
+def clear_login_username_limit(username: str):
+    """Reset the attempts counted for username after it logged in successfully"""
+    try:
+        limiter.limiter.clear(login_username_limit, "login", username)
+    except Exception as exc:
+        logger.warning("Login username limit unavailable: %s", exc)
+
+def rate_limit_response(detail: str) -> ORJSONResponse:
+    """429 response shared by every rate limit so clients see a single format"""
+    response = ORJSONResponse(
         status_code=429,
         content={
             "error": "Rate limit exceeded",
-            "message": f"Rate limit exceeded: {exc.detail}",
+            "message": f"Rate limit exceeded: {detail}",
             "retry_after": 60
         }
     )
     response.headers["Retry-After"] = "60"
     return response
 
+# Custom rate limit exceeded handler
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return rate_limit_response(exc.detail)
+
 # Rate limiting decorators for different endpoint types
 def auth_rate_limit():
     """Rate limit for authentication endpoints - more restrictive"""
@@ -1,32 +1,66 @@
+import hashlib
+import time
+import jwt
 from datetime import datetime, timedelta
 from typing import Any, Optional
-from jose import jwt, JWTError
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-class JWTHandler:
-    @staticmethod
-    def create_access_token(data: dict, expires_delta: Optional[int] = None):
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(seconds=expires_delta or settings.JWT_EXPIRATION_SECONDS)
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-        return encoded_jwt
-
-    @staticmethod
-    def decode_access_token(token: str) -> Any:
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+# Argon2id with the OWASP recommended 46 MiB memory cost
+password_hasher = PasswordHasher(time_cost=3, memory_cost=46 * 1024, parallelism=1)
+# Only used to verify hashes created before the move to Argon2id
+legacy_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Read once at import instead of going through the settings object on every sign/verify call
+_JWT_KEY = settings.JWT_SECRET_KEY.encode()
+_JWT_ALG = settings.JWT_ALGORITHM
+_JWT_ALGORITHMS = [_JWT_ALG]
+_JWT_TTL = settings.JWT_EXPIRATION_SECONDS
+
+# Decoded payloads keyed by a digest of the raw token, so repeated requests skip signature verification
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+def create_access_token(data: dict, expires_delta: Optional[int] = None):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(seconds=expires_delta or _JWT_TTL)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALG)
+    return encoded_jwt
+
+def decode_access_token(token: str) -> Any:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        # A cached entry must never outlive the token itself
+        if payload.get("exp", 0) > time.time():
             return payload
-        except JWTError:
-            return None
+        _token_cache.pop(key, None)
+    try:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options={"require": ["exp", "sub"]})
+    except jwt.PyJWTError:
+        return None
+    _token_cache[key] = payload
+    return payload
+
+def verify_password(plain_password, hashed_password):
+    if hashed_password.startswith("$2"):
+        return legacy_pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def needs_rehash(hashed_password):
+    if hashed_password.startswith("$2"):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
 
-    @staticmethod
-    def verify_password(plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+def get_password_hash(password):
+    return password_hasher.hash(password)
 
-    @staticmethod
-    def get_password_hash(password):
-        return pwd_context.hash(password)
+def init_hash_worker():
+    # Runs once per hashing worker process: load the bcrypt backend before the first legacy verify needs it
+    legacy_pwd_context.handler("bcrypt").get_backend()
@@ -2,7 +2,20 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=True,
+    future=True,
+    pool_size=20,
+    max_overflow=40,
+    # No SELECT 1 on checkout; pool_recycle retires connections before server-side timeouts instead
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    # Reuse the most recently returned connection so its prepared-statement cache stays warm
+    pool_use_lifo=True,
+    # Larger per-connection caches so every task/user lookup stays prepared instead of being re-parsed and re-planned
+    connect_args={"statement_cache_size": 1024, "prepared_statement_cache_size": 1024},
+)
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
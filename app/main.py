@@ -1,12 +1,18 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 import time
 
 from app.api.routes import router as api_router
-from app.core.logging import logger
+from app.core.config import settings
+from app.core.logging import logger, log_listener
 from app.core.rate_limiting import limiter, rate_limit_handler
+from app.core.security import init_hash_worker
 from slowapi.errors import RateLimitExceeded
 
-app = FastAPI(title="TODO API", version="1.0.0")
+app = FastAPI(title="TODO API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Add rate limiting state
 app.state.limiter = limiter
@@ -14,14 +20,28 @@ app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(f"Request: {request.method} {request.url.path} - Completed in {process_time:.4f}s - Status: {response.status_code}")
+    process_time_ns = time.perf_counter_ns() - start_ns
+    logger.info("Request: %s %s - Completed in %.4fs - Status: %s", request.method, request.url.path, process_time_ns / 1e9, response.status_code)
     return response
 
 @app.on_event("startup")
 async def startup_event():
+    # Dedicated process pool for password hashing so concurrent logins use every core without touching the event loop.
+    # spawn avoids forking a process that already runs the event loop and its threads
+    app.state.hash_pool = ProcessPoolExecutor(
+        max_workers=settings.HASH_POOL_WORKERS or max(1, (os.cpu_count() or 1) // settings.WEB_CONCURRENCY),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_hash_worker,
+    )
     logger.info("Application startup")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.hash_pool.shutdown()
+    logger.info("Application shutdown")
+    # Flush queued records to the console and app.log before the process exits
+    log_listener.stop()
+
 app.include_router(api_router)
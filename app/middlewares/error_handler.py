@@ -10,9 +10,9 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             return response
         except Exception as exc:
-            logger.error(f"Unhandled error: {exc}")
-            from fastapi.responses import JSONResponse
-            return JSONResponse(
+            logger.error("Unhandled error: %s", exc)
+            from fastapi.responses import ORJSONResponse
+            return ORJSONResponse(
                 status_code=500,
                 content={"detail": "Internal server error"}
             )
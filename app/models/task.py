@@ -1,6 +1,6 @@
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -17,7 +17,8 @@ class Task(Base):
     id_usuario = Column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="tasks")
     __table_args__ = (
+        UniqueConstraint("id_usuario", "titulo", name="uq_tasks_user_titulo"),
         Index("idx_tasks_user_id", "id_usuario"),
         Index("idx_tasks_estado", "estado"),
-        Index("idx_tasks_fecha_creacion", "fecha_creacion"),
+        Index("idx_tasks_user_created", "id_usuario", "fecha_creacion", "id"),
     )
@@ -1,6 +1,6 @@
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, bindparam, lambda_stmt, select
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -14,3 +14,6 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     tasks = relationship("Task", back_populates="user")
+
+# Shared by login and get_current_user: compiled once per process, callers only bind the username
+user_by_username = lambda_stmt(lambda: select(User).where(User.username == bindparam("username")))
@@ -45,6 +45,7 @@ class TaskListResponse(BaseModel):
     total: int = Field(..., description="Total number of tasks")
     limit: int = Field(..., description="Maximum number of tasks returned")
     offset: int = Field(..., description="Number of tasks skipped")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
 
 class TaskFilters(BaseModel):
     limit: int = Field(default=100, ge=1, le=1000, description="Items per page")